@@ -32,7 +32,6 @@ def limit_switch(motor, m, pot):
         direction *= -1
     if velocity == 0 or pot.direction[motor] == 0:
         return False
-    #print(pot.direction, direction)
     return (pot.direction[motor] != direction) and m.should_reverse(motor)
 
 
@@ -75,6 +74,8 @@ def reverse_limit(m, pot, limits):
             limit.clear()
             while limit_switch(motor, m, pot) or m.limit_reversal:
                 # Continue checking if the limit is still active to ensure
-                # pot.direction is updated correctly.
-                continue
+                # pot.direction is updated correctly. The Pico sends about
+                # one pot reading per second (INT_LEN readings 10 ms apart),
+                # so there is no point in spinning.
+                time.sleep(0.01)
     return limits
@@ -139,6 +139,7 @@ class PololuMotor(Motor):
         super().__init__(logger=logger)
         self.MIN_SPEED = MIN_SPEED["pololu"]
         self.MAX_SPEED = MAX_SPEED["pololu"]
+        self._dc_per_speed = 100 / self.MAX_SPEED  # duty cycle (%) per speed
         GPIO.setwarnings(False)
         GPIO.setmode(GPIO.BCM)
         # setup all pins as output
@@ -203,7 +204,7 @@ class PololuMotor(Motor):
 
     def _speed2dc(self, speed):
         """Convert speed to duty cycle for PWM."""
-        return np.abs(speed) / self.MAX_SPEED * 100
+        return abs(speed) * self._dc_per_speed
 
     def set_drive(self, motor, direction, speed):
         """
@@ -7,11 +7,16 @@ from threading import Event, Thread, Lock
 import yaml
 from eigsep_motor_control.serial_params import BAUDRATE, INT_LEN
 
+INV_INT_LEN = 1 / INT_LEN
+
 
 class Potentiometer:
 
     NBITS = 16  # ADC number of bits
     VMAX = 3.3
+    _VOLT_PER_BIT = VMAX / (2**NBITS - 1)
+    # the Pico sends ADC counts summed over INT_LEN measurements
+    _VOLT_PER_SUM = _VOLT_PER_BIT / INT_LEN
 
     # serial connection constants (BAUDRATE defined in main.py)
     PORT = "/dev/ttyACM0"
@@ -23,24 +28,94 @@ class Potentiometer:
         """
         self.ser = serial.Serial(port=self.PORT, baudrate=BAUDRATE)
         self.ser.reset_input_buffer()
+        self._rxbuf = bytearray()  # bytes received after the last newline
+        # the port may be opened mid-line, the first line is dropped
+        self._rx_synced = False
+        self._set_low_latency()
 
         # voltage range of the pots
         path = Path(__file__).parent / "config.yaml"
         with open(path, "r") as f:
             config = yaml.safe_load(f)
-        self.VOLT_RANGE = config["volt_range"]
+        self._set_volt_range(config["volt_range"])
         self.POT_ZERO_THRESHOLD = 0.0015
 
-        # voltage measurements (az, alt)
+        # pot measurements (az, alt)
         size = 5  # number of measurements to store XXX
-        self.volts = np.zeros((size, 2))
+        self._init_buffer(size)
         self.reset_volt_readings()
 
+    def _init_buffer(self, size):
+        """
+        Allocate the circular buffer of pot readings. Readings are stored as
+        the raw ADC sums sent by the Pico so that the checks on every new
+        reading work on integers; the volt limits are converted once in
+        ``_set_volt_range''.
+
+        Parameters
+        ----------
+        size : int
+            Number of readings to keep.
+
+        """
+        self.counts = np.zeros((size, 2), dtype=np.int32)
+        self.idx = 0  # total number of readings, next write is idx % size
+        # the pot thread and the main loop both read the pots, this keeps a
+        # read and its buffer write together
+        self._read_lock = Lock()
+
+    def _set_volt_range(self, volt_range):
+        """
+        Set the allowed voltage range of the pots.
+
+        Parameters
+        ----------
+        volt_range : dict
+            Dictionary with keys 'az' and 'alt' mapping to the (min, max)
+            voltage of the respective pot.
+
+        """
+        self.VOLT_RANGE = volt_range
+        # (az, alt) limits in raw counts for vectorized comparisons
+        vmin, vmax = np.array([volt_range[m] for m in ["az", "alt"]]).T
+        self._cmin = np.floor(vmin / self._VOLT_PER_SUM).astype(np.int32)
+        self._cmax = np.ceil(vmax / self._VOLT_PER_SUM).astype(np.int32)
+
+    def _set_low_latency(self):
+        """
+        Ask the kernel to hand over serial data as soon as it arrives instead
+        of batching it. USB-serial adapters like FTDI otherwise hold data for
+        up to ``latency_timer'' ms (16 ms by default). Drivers that do not
+        support this are left as they are.
+
+        """
+        try:
+            self.ser.set_low_latency_mode(True)
+        except (AttributeError, ValueError, OSError):
+            logging.debug("Low latency mode not supported on %s.", self.PORT)
+        tty = Path(self.PORT).resolve().name
+        timer = Path("/sys/bus/usb-serial/devices") / tty / "latency_timer"
+        try:
+            timer.write_text("1")
+        except OSError:
+            pass  # not a usb-serial adapter or no permission
+
+    @property
+    def volts(self):
+        """
+        The last ``self.size'' pot readings in volts, shape (size, 2),
+        ordered from oldest to newest. This unrolls the circular buffer, so
+        it is meant for occasional inspection rather than the monitor loop.
+
+        """
+        shift = -(self.idx % self.counts.shape[0])
+        return np.roll(self.counts, shift, axis=0) * self._VOLT_PER_SUM
+
     @property
     def vdiff(self):
         """
-        Find the difference between the last ``self.size'' voltage readings
-        of each pot.
+        Find the difference between the last two voltage readings of each
+        pot.
 
         Returns
         -------
@@ -49,9 +124,32 @@ class Potentiometer:
             the last two measurements for each pot. Keys are 'az' and 'alt'.
 
         """
-        az, alt = np.diff(self.volts, axis=0).T
+        n = self.counts.shape[0]
+        newest = self.counts[(self.idx - 1) % n]
+        prev = self.counts[(self.idx - 2) % n]
+        az, alt = (newest - prev) * self._VOLT_PER_SUM
         return {"az": az, "alt": alt}
 
+    def _direction_vec(self):
+        """
+        Direction of the az and alt pots as an array of -1, 0, or 1, based
+        on the last ``self.size'' voltage readings.
+
+        """
+        # XXX might need to adjust the size so that we can pick up change
+        # of direction quickly enough
+        # the mean of the consecutive differences in the buffer telescopes
+        # to (newest - oldest) / (size - 1); the oldest reading sits at the
+        # next write position
+        n = self.counts.shape[0]
+        delta = self.counts[(self.idx - 1) % n] - self.counts[self.idx % n]
+        d = np.sign(delta)
+        # the pot is considered stationary if changes are below threshold,
+        # converted here so that changes to POT_ZERO_THRESHOLD take effect
+        zero_counts = self.POT_ZERO_THRESHOLD * (n - 1) / self._VOLT_PER_SUM
+        d[np.abs(delta) < zero_counts] = 0
+        return d
+
     @property
     def direction(self):
         """
@@ -59,17 +157,8 @@ class Potentiometer:
         voltage readings of the respective pot.
 
         """
-        # XXX might need to adjust the size so that we can pick up change
-        # of direction quickly enough
-        d = {}
-        for k, v in self.vdiff.items():
-            x = np.mean(v)
-            # the pot is considered stationary if changes are below threshold
-            if np.abs(x) < self.POT_ZERO_THRESHOLD:
-                d[k] = 0
-            else:
-                d[k] = int(np.sign(x))
-        return d
+        az, alt = self._direction_vec().tolist()
+        return {"az": az, "alt": alt}
 
     def bit2volt(self, analog_value):
         """
@@ -86,10 +175,51 @@ class Potentiometer:
             The calculated voltage corresponding to the bit number.
 
         """
-        res = 2**self.NBITS - 1
-        voltage = (self.VMAX / res) * analog_value
+        voltage = analog_value * self._VOLT_PER_BIT
         return voltage
 
+    def _read_line(self):
+        """
+        Read the raw pot values from the Pico. Everything waiting on the
+        serial port is drained in one read and only the most recent
+        complete line is used, so the readings do not lag behind the Pico.
+        The first line after opening the port is discarded since it may be
+        partial, as are lines that do not hold exactly two values.
+
+        Returns
+        -------
+        data : np.ndarray
+            The ADC counts of the (az, alt) pots summed over INT_LEN
+            measurements.
+
+        """
+        while True:
+            # block for at least one byte, then take whatever else is queued
+            self._rxbuf += self.ser.read(max(1, self.ser.in_waiting))
+            if not self._rx_synced:
+                first = self._rxbuf.find(b"\n")
+                if first < 0:
+                    continue
+                # anything before the first newline may be the tail of a
+                # line sent before the port was opened
+                del self._rxbuf[: first + 1]
+                self._rx_synced = True
+            end = self._rxbuf.rfind(b"\n")
+            if end < 0:
+                continue
+            start = self._rxbuf.rfind(b"\n", 0, end) + 1
+            line = bytes(self._rxbuf[start:end])
+            del self._rxbuf[: end + 1]
+            try:
+                data = np.fromstring(line, dtype=np.int32, sep=" ")
+            except ValueError:
+                data = None
+            # garbled lines that do not hold two values are dropped rather
+            # than stored as readings
+            if data is not None and data.size == 2:
+                return data
+            logging.warning("Discarding malformed pot reading %r.", line)
+
     def read_analog(self):
         """
         Read the analog values of the pots.
@@ -102,9 +232,25 @@ class Potentiometer:
             pot, the second value is the altitude pot.
 
         """
-        data = self.ser.readline().decode("utf-8").strip()
-        data = [int(d) for d in data.split()]
-        return np.array(data) / INT_LEN
+        with self._read_lock:
+            data = self._read_line()
+        return data * INV_INT_LEN
+
+    def _read_counts(self):
+        """
+        Read the pots and store the raw reading in the circular buffer.
+
+        Returns
+        -------
+        counts : np.ndarray
+            The (az, alt) ADC counts summed over INT_LEN measurements.
+
+        """
+        with self._read_lock:
+            counts = self._read_line()
+            self.counts[self.idx % self.counts.shape[0]] = counts
+            self.idx += 1
+        return counts
 
     def read_volts(self, motor=None):
         """
@@ -125,8 +271,7 @@ class Potentiometer:
             voltages if ``motor'' is None.
 
         """
-        v = self.bit2volt(self.read_analog())
-        self.volts = np.concatenate((self.volts[1:], v[None]), axis=0)
+        v = self._read_counts() * self._VOLT_PER_SUM
         if motor == "az":
             return v[0]
         elif motor == "alt":
@@ -140,36 +285,42 @@ class Potentiometer:
         is useful to get meaningful derivatives.
 
         """
-        for i in range(self.volts.shape[0]):
+        for i in range(self.counts.shape[0]):
             _ = self.read_volts()
             time.sleep(0.05)
 
-    def _trigger_reverse(self, motor, volt_reading):
+    def _trigger_reverse(self, counts):
         """
-        Continuously monitor the voltage levels of one pot to see if motor
-        reaches its limit.
+        Check if the az and alt motors have reached the limits of their
+        pots.
 
         Parameters
         ----------
-        motor : str
-            The motor to monitor. Either 'az' or 'alt'.
-        volt_reading : float
-            The current voltage reading of the motor.
+        counts : np.ndarray
+            The current raw readings of the az and alt pots, as returned by
+            ``_read_counts''.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean array, True for the motors (az, alt) that are moving
+            past a voltage limit.
 
         """
-        vmin, vmax = self.VOLT_RANGE[motor]
-        d = self.direction[motor]
+        d = self._direction_vec()
         # check if the current voltage is outside the limits
-        if d > 0 and volt_reading >= vmax:
-            logging.warning(f"Pot {motor} at max voltage.")
-            return True
-        elif d < 0 and volt_reading <= vmin:
-            logging.warning(f"Pot {motor} at min voltage.")
-            return True
-        else:
-            return False
-
-    def monitor(self, az_event, alt_event):
+        at_max = (d > 0) & (counts >= self._cmax)
+        at_min = (d < 0) & (counts <= self._cmin)
+        triggered = at_max | at_min
+        if triggered.any():
+            for motor, hi, lo in zip(["az", "alt"], at_max, at_min):
+                if hi:
+                    logging.warning(f"Pot {motor} at max voltage.")
+                elif lo:
+                    logging.warning(f"Pot {motor} at min voltage.")
+        return triggered
+
+    def monitor(self, az_event, alt_event, wake=None):
         """
         Continuously monitor the voltage levels of the 'az' (azimuth) and 'alt'
         (altitude) motors and checks these against predefined voltage ranges to
@@ -181,27 +332,26 @@ class Potentiometer:
             An event triggered when the azimuth motor reaches its limit.
         alt_event : threading.Event
             An event triggered when the altitude motor reaches its limit.
+        wake : threading.Event, optional
+            Set together with ``az_event'' or ``alt_event'' so a single
+            waiter can react to either of them.
 
         """
-        names = []
-        events = []
-        if az_event is not None:
-            names.append("az")
-            events.append(az_event)
-        if alt_event is not None:
-            names.append("alt")
-            events.append(alt_event)
-
-        if not names:
+        events = [az_event, alt_event]
+        if az_event is None and alt_event is None:
             return
 
         while True:
-            for m, event in zip(names, events):
-                v = self.read_volts(motor=m)
-                logging.info(f"{m}: {v:.3f} V ")
-                trigger = self._trigger_reverse(m, v)
-                if trigger:
+            # one reading contains both pots, check them together
+            counts = self._read_counts()
+            v = counts * self._VOLT_PER_SUM
+            logging.info("az: %.3f V, alt: %.3f V", v[0], v[1])
+            triggered = self._trigger_reverse(counts)
+            for event, trigger in zip(events, triggered):
+                if trigger and event is not None:
                     event.set()
+                    if wake is not None:
+                        wake.set()
                     # self.reset_volt_readings()
 
 class DummyPotentiometer(Potentiometer):
@@ -211,11 +361,11 @@ class DummyPotentiometer(Potentiometer):
         path = Path(__file__).parent / "config.yaml"
         with open(path, "r") as f:
             config = yaml.safe_load(f)
-        self.VOLT_RANGE = config["dummy_volt_range"]
+        self._set_volt_range(config["dummy_volt_range"])
         self.POT_ZERO_THRESHOLD = 0.001
-        # Voltage measurements (az, alt)
+        # Pot measurements (az, alt)
         size = 2  # Number of measurements to store
-        self.volts = np.zeros((size, 2))
+        self._init_buffer(size)
         self.motor_system = motor_system
         self.simulated_pots = {"az": 32768, "alt": 32768}  # Initial simulated mid-range pot values
         self.update_thread = Thread(target=self.update_pot_values, daemon=True)
@@ -242,11 +392,11 @@ class DummyPotentiometer(Potentiometer):
                     # Clamp the values to stay within 16-bit range
                     self.simulated_pots[motor] = max(0, min(65535, new_value))
 
-    def read_analog(self):
+    def _read_line(self):
         """
-        Simulate the reading of analog values from the pots based on current simulated values.
+        Simulate the Pico's summed readings of the pots based on current simulated values.
         """
         time.sleep(0.5)
         with self.lock:
             simulated_values = np.array([self.simulated_pots["az"], self.simulated_pots["alt"]])
-        return simulated_values
+        return simulated_values * INT_LEN
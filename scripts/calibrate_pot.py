@@ -1,13 +1,11 @@
 from argparse import ArgumentParser
 import logging
-import numpy as np
 from pathlib import Path
-import time
 import yaml
 import eigsep_motor_control as emc
 
 
-def calibrate(motor, m, direction):
+def calibrate(motor, m, pot, direction):
     """
     Calibrate the potentiometer corresponding to the motor.
 
@@ -17,6 +15,8 @@ def calibrate(motor, m, direction):
         Name of motor to calibrate. Either 'az' or 'alt'.
     m : emc.Motor
         Instance of the emc.Motor class.
+    pot : emc.Potentiometer
+        Instance of the emc.Potentiometer class.
     direction : int
         Direction of the motor. 1 for forward (increasing pot voltages),
         -1 for reverse (decreasing pot voltages).
@@ -29,8 +29,6 @@ def calibrate(motor, m, direction):
         True if the pot was stuck, False otherwise.
 
     """
-    pot = emc.Potentiometer()
-
     if direction == -1:
         vel = m.MIN_SPEED
     elif direction == 1:
@@ -48,31 +46,43 @@ def calibrate(motor, m, direction):
     m.set_velocity(az_vel=az_vel, alt_vel=alt_vel)
     m.logger.warning("Attack mode.")
     pot.reset_volt_readings()
-    # check if limit switch is already pulled at start-up and undo it
-    while pot.direction[motor] == -direction:
-        m.logger.warning("Limit switch is triggered, reversing")
-        v = pot.read_volts(motor=motor)
-        time.sleep(0.1)
+    # NOTE: read_volts blocks until the Pico sends a new reading, this paces
+    # the loop below
+    # bind the methods used in the loop once
+    read_volts = pot.read_volts
+    info = m.logger.info
+    # extremum pot voltage (max if forward, min if reverse)
+    extremum = max if direction == 1 else min
 
-    # loops until the switch is triggered
-    last_motion = time.time()
-    while pot.direction[motor] == direction:
-        print(pot.direction[motor], direction)
-        v = pot.read_volts(motor=motor)
-        m.logger.info(f"{v=:.3f}")
-        time.sleep(0.1)
-    # get the extremum pot voltage (max if forward, min if reverse)
-    vm = np.max(np.abs(pot.volts[:, emc.motor.MOTOR_ID[motor]]))
-    m.logger.info(f"Extremum voltage: {vm:.3f}")
-    while pot.direction[motor] == 0:  # pot stuck
-        v = pot.read_volts(motor=motor)
-        m.logger.info(f"{v=:.3f}")
-        time.sleep(0.01)
-    m.logger.info("Reverse until switch is released.")
-    while pot.direction[motor] == -direction:
-        v = pot.read_volts(motor=motor)
-        m.logger.info(f"{v=:.3f}")
-        time.sleep(0.01)
+    # PRE: limit switch already pulled at start-up, wait until it's undone
+    # ATTACK: motor moves in ``direction'' until the switch is triggered
+    # STUCK: pot stops while the switch reverses the motor
+    # RELEASE: motor reverses until the switch is released
+    PRE, ATTACK, STUCK, RELEASE = range(4)
+    state = PRE
+    while True:
+        d = pot.direction[motor]
+        # the checks fall through so several states can pass on one reading
+        if state == PRE and d != -direction:
+            vm = extremum(pot.volts[:, emc.motor.MOTOR_ID[motor]])
+            state = ATTACK
+        if state == ATTACK and d != direction:
+            info("Extremum voltage: %.3f", vm)
+            state = STUCK
+        if state == STUCK and d != 0:
+            info("Reverse until switch is released.")
+            state = RELEASE
+        if state == RELEASE and d != -direction:
+            break
+
+        if state == PRE:
+            m.logger.warning("Limit switch is triggered, reversing")
+            read_volts(motor=motor)
+            continue
+        v = read_volts(motor=motor)
+        if state == ATTACK:
+            vm = extremum(vm, v)
+        info("v=%.3f", v)
 
     m.stop()  # stop in attacking mode
     return vm
@@ -114,6 +124,7 @@ if __name__ == "__main__":
         m = emc.QwiicMotor(logger=logger)
     else:
         raise ValueError("Invalid board, must be ``pololu'' or ``qwiic''.")
+    pot = emc.Potentiometer()
 
     path = Path(__file__).parent.parent / "eigsep_motor_control" / "config.yaml"
     with open(path, "r") as f:
@@ -123,8 +134,8 @@ if __name__ == "__main__":
         # voltage difference between min and max pot voltage
         vdiff = volt_range[motor][1] - volt_range[motor][0]
         logger.info(f"Calibrating {motor} potentiometer.")
-        vmax = calibrate(motor, m, 1)
-        vmin = calibrate(motor, m, -1)
+        vmax = calibrate(motor, m, pot, 1)
+        vmin = calibrate(motor, m, pot, -1)
         volt_range[motor] = [float(vmin)+DELTA, float(vmax)-DELTA]
     config["volt_range"] = volt_range
     with open(path, "w") as f:
@@ -7,17 +7,27 @@ ADC_PIN1 = 27
 ADC_PIN2 = 28
 BAUDRATE = 115200
 INT_LEN = 100  # number of readings to average
-SLEEP = 0.01  # seconds between readings
+SLEEP_US = 10000  # microseconds between readings
 
 adc1 = ADC(Pin(ADC_PIN1))  # azimuth
 adc2 = ADC(Pin(ADC_PIN2))  # altitude
 
+# readings are scheduled against a deadline so the time spent reading and
+# printing does not stretch the sampling period
+deadline = time.ticks_us()
 while True:
     value1 = 0
     value2 = 0
     for cnt in range(INT_LEN):
         value1 += adc1.read_u16()
         value2 += adc2.read_u16()
-        time.sleep(SLEEP)
+        deadline = time.ticks_add(deadline, SLEEP_US)
+        remaining = time.ticks_diff(deadline, time.ticks_us())
+        if remaining < 0:
+            # fell behind (e.g. print blocked on USB), resync rather than
+            # taking the next readings back-to-back to catch up
+            deadline = time.ticks_us()
+        else:
+            time.sleep_us(remaining)
     print(value1, value2)
     led.toggle()
@@ -4,7 +4,7 @@ import time
 from threading import Event, Thread
 import eigsep_motor_control as emc
 
-start_time = time.time()
+start_time = time.monotonic()
 # Setup logging for information and debugging.
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -79,9 +79,13 @@ ALT_VEL = args.el if args.el is not None else emc.motor.MAX_SPEED[args.board]
 if args.pot:
     # Initialize events for reversing motor direction based on pot monitoring.
     reverse_events = [Event() if vel != 0 else None for vel in [AZ_VEL, ALT_VEL]]
+    # set by the pot thread whenever a reverse event is set
+    wake = Event()
     pot = emc.DummyPotentiometer(motor) if args.dummy_pot else emc.Potentiometer()
     # Create and start a separate thread to monitor potentiometer if enabled.
-    thd = Thread(target=pot.monitor, args=reverse_events, daemon=True)
+    thd = Thread(
+        target=pot.monitor, args=(*reverse_events, wake), daemon=True
+    )
     logging.info("Starting pot thread.")
     thd.start()
 else:
@@ -95,7 +99,8 @@ if args.safe:
     # events indicating limit switches are triggered
     limits = [Event(), Event()]
 
-last_motion = time.time()  # time of last motor movement
+# no-motion deadline, pushed back whenever either motor moves
+motion_deadline = time.monotonic() + 10
 try:
     while True:
         if not args.pot:  # nothing is happening, there are no safety checks
@@ -105,10 +110,11 @@ try:
         # else we monitor the potentiometer
         if args.safe:
             # check if both motors show no movement
-            if pot.direction["az"] != 0 or pot.direction["alt"] != 0:
-                last_motion = time.time()
+            direction = pot.direction
+            if direction["az"] != 0 or direction["alt"] != 0:
+                motion_deadline = time.monotonic() + 10
             # no movement detected for 10 seconds
-            elif time.time() >= last_motion + 10:
+            elif time.monotonic() >= motion_deadline:
                 logging.warning(
                     "No movement detected from either motor. Exiting."
                 )
@@ -118,20 +124,28 @@ try:
             limits = emc.reverse_limit(motor, pot, limits)
 
         # Check and react to reverse signals set by potentiometer monitoring.
-        for name, event in zip(["az", "alt"], reverse_events):
-            if event is None:
-                continue
-            if event.is_set():
-                print(f"Reversing {name} motor.")
-                motor.reverse(name)
-                time.sleep(0.5)
+        pending = [
+            (name, event)
+            for name, event in zip(["az", "alt"], reverse_events)
+            if event is not None and event.is_set()
+        ]
+        for name, event in pending:
+            print(f"Reversing {name} motor.")
+            motor.reverse(name)
+        if pending:
+            # let the pots register the new direction(s) before clearing
+            time.sleep(0.5)
+            for name, event in pending:
                 event.clear()
 
-        time.sleep(0.1)
+        # sleep until the pot thread flags a reversal, the timeout keeps
+        # the safety checks above running when nothing happens
+        wake.wait(timeout=0.1)
+        wake.clear()
 except KeyboardInterrupt:
     print("\nExiting.")
 finally:
     # ensure motors are stopped on exit.
-    run_time = time.time() - start_time
+    run_time = time.monotonic() - start_time
     print(f"Run Time: {run_time} seconds, {run_time/3600} hours.")
     motor.cleanup()
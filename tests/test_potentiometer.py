@@ -0,0 +1,155 @@
+import numpy as np
+import pytest
+from threading import Thread
+
+import eigsep_motor_control as emc
+from eigsep_motor_control import potentiometer
+
+INT_LEN = emc.serial_params.INT_LEN
+
+
+class FakeSerial:
+    """Stand-in for serial.Serial that streams pot readings like the Pico"""
+
+    def __init__(self, *args, **kwargs):
+        self.data = bytearray()  # bytes that have arrived at the port
+        self.pending = []  # lines the Pico has yet to send
+
+    def push(self, az, alt):
+        """Queue one Pico line with the given (summed) ADC values"""
+        self.pending.append(f"{az} {alt}\r\n".encode())
+
+    def reset_input_buffer(self):
+        pass
+
+    @property
+    def in_waiting(self):
+        return len(self.data)
+
+    def read(self, size=1):
+        if not self.data:  # block until the next line arrives
+            self.data += self.pending.pop(0)
+        out = bytes(self.data[:size])
+        del self.data[:size]
+        return out
+
+
+@pytest.fixture
+def pot(monkeypatch):
+    ser = FakeSerial()
+    # port opened mid-line, this tail fragment must not become a reading
+    ser.pending.append(b"800 3276800\r\n")
+    for i in range(5):
+        ser.push(0, 0)
+    monkeypatch.setattr(potentiometer.serial, "Serial", lambda **kw: ser)
+    p = emc.Potentiometer()
+    p.fake_ser = ser
+    return p
+
+
+def _to_counts(pot, az, alt):
+    """Summed ADC counts of a Pico reading with the given voltages"""
+    res = 2**pot.NBITS - 1
+    counts = np.round(np.array([az, alt]) / pot.VMAX * res * INT_LEN)
+    return counts.astype(int)
+
+
+def _push_volts(pot, az, alt):
+    """Queue a reading that converts to the given voltages"""
+    pot.fake_ser.push(*_to_counts(pot, az, alt))
+
+
+def test_partial_first_line_discarded(pot):
+    assert pot.idx == 5
+    assert not pot.counts.any()
+
+
+def test_read_volts(pot):
+    _push_volts(pot, 1.0, 2.0)
+    v = pot.read_volts()
+    assert np.allclose(v, [1.0, 2.0], atol=1e-4)
+    _push_volts(pot, 1.5, 2.5)
+    assert np.isclose(pot.read_volts(motor="az"), 1.5, atol=1e-4)
+    _push_volts(pot, 1.5, 2.5)
+    assert np.isclose(pot.read_volts(motor="alt"), 2.5, atol=1e-4)
+
+
+def test_ring_buffer(pot):
+    size = pot.volts.shape[0]
+    for i in range(2 * size + 1):
+        _push_volts(pot, 0.1 * i, 3.0 - 0.1 * i)
+        pot.read_volts()
+    vdiff = pot.vdiff
+    assert np.isclose(vdiff["az"], 0.1, atol=1e-4)
+    assert np.isclose(vdiff["alt"], -0.1, atol=1e-4)
+    assert pot.direction == {"az": 1, "alt": -1}
+    # volts is ordered from oldest to newest
+    assert np.all(np.diff(pot.volts[:, 0]) > 0)
+    assert np.isclose(pot.volts[-1, 0], 0.2 * size, atol=1e-4)
+    # a stationary pot flushes out the old readings
+    for i in range(size):
+        _push_volts(pot, 1.0, 1.0)
+        pot.read_volts()
+    assert pot.direction == {"az": 0, "alt": 0}
+    # the threshold is read on every call
+    _push_volts(pot, 1.1, 1.0)
+    pot.read_volts()
+    assert pot.direction == {"az": 1, "alt": 0}
+    pot.POT_ZERO_THRESHOLD = 0.1
+    assert pot.direction == {"az": 0, "alt": 0}
+
+
+def test_read_analog_drains_backlog(pot):
+    pot.fake_ser.data += b"1 2\r\n3 4\r\n5 6"  # ends with incomplete line
+    assert np.allclose(pot.read_analog(), np.array([3, 4]) / INT_LEN)
+    assert pot.fake_ser.in_waiting == 0
+    pot.fake_ser.data += b"\r\n"
+    assert np.allclose(pot.read_analog(), np.array([5, 6]) / INT_LEN)
+
+
+def test_malformed_lines_discarded(pot):
+    size = pot.counts.shape[0]
+    for i in range(size):
+        pot.fake_ser.push(7, 8)
+        pot.read_volts()
+    idx = pot.idx
+    pot.fake_ser.pending.append(b"456\r\n")  # one value only
+    pot.fake_ser.pending.append(b"\r\n")  # empty line
+    pot.fake_ser.push(9, 10)
+    assert pot._read_counts().tolist() == [9, 10]
+    assert pot.idx == idx + 1
+    assert pot.counts.tolist().count([9, 10]) == 1
+    assert pot.counts.tolist().count([7, 8]) == size - 1
+
+
+def test_concurrent_reads(pot):
+    # the pot thread and the main loop may read at the same time
+    nreads = 200
+    for i in range(2 * nreads):
+        pot.fake_ser.push(i, i + 1)
+    results = []
+
+    def reader():
+        for i in range(nreads):
+            results.append(pot._read_counts().tolist())
+
+    threads = [Thread(target=reader) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(results) == [[i, i + 1] for i in range(2 * nreads)]
+    assert pot.idx == 5 + 2 * nreads
+
+
+def test_trigger_reverse(pot):
+    pot._set_volt_range({"az": [0.5, 1.5], "alt": [0.5, 1.5]})
+    # az moving up, alt moving down
+    for i in range(pot.volts.shape[0]):
+        _push_volts(pot, 1.0 + 0.2 * i, 1.2 - 0.1 * i)
+        counts = pot._read_counts()
+    assert pot._trigger_reverse(counts).tolist() == [True, False]
+    counts = _to_counts(pot, 1.0, 0.4)
+    assert pot._trigger_reverse(counts).tolist() == [False, True]
+    # moving away from the limit does not trigger
+    assert not pot._trigger_reverse(_to_counts(pot, 0.2, 1.8)).any()